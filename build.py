@@ -18,11 +18,35 @@ Usage:
     uv run python build.py
 """
 
+import functools
+import html
+import json
+import os
+import re
 import shutil
 import subprocess
 import sys
 import time
+import urllib.request
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from uuid import uuid4
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+import xxhash
+import yaml
+from lxml import etree
+from lxml import html as lxml_html
+
+# Dispatch YAML parsing/serialization to libyaml's C implementation when
+# PyYAML was built with it; fall back to the pure-Python classes otherwise
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 # =============================================================================
 # Configuration
@@ -32,6 +56,10 @@ WORK_DIR = Path("build")
 CONTENT_DIR = Path("docs2db_content")
 OUTPUT_DIR = Path("dist")
 ANTORA_IMAGE = "docker.io/antora/antora"
+UI_BUNDLE_URL = (
+    "https://gitlab.com/fedora/docs/docs-website/ui-bundle/-/jobs/artifacts/HEAD/raw/"
+    "build/ui-bundle.zip?job=bundle-stable"
+)
 
 # Official Fedora Docs site repository (contains the Antora playbook)
 FEDORA_DOCS_SITE_REPO = "https://gitlab.com/fedora/docs/docs-website/docs-fp-o.git"
@@ -39,23 +67,123 @@ FEDORA_DOCS_SITE_REPO = "https://gitlab.com/fedora/docs/docs-website/docs-fp-o.g
 # License to assign to all Fedora documentation
 FEDORA_LICENSE = "CC-BY-SA 4.0"
 
+# The clones are shallow and thrown away after the build, so skip git's
+# opportunistic auto-gc and fsmonitor bookkeeping
+GIT = ["git", "-c", "gc.auto=0", "-c", "core.fsmonitor=false"]
+
+# Concurrent embedding workers; embedding throughput scales with in-flight
+# requests, so set EMBED_WORKERS=1 if your backend enforces strict rate limits
+EMBED_WORKERS = int(os.environ.get("EMBED_WORKERS", max(2, (os.cpu_count() or 4) // 2)))
+
+# <title> always sits in the first few KB of an Antora page, so a byte-level
+# regex is enough — no need to traverse the parse tree for it
+TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.I | re.S)
+
+# Compiled once; lxml recompiles string XPath expressions on every call
+ARTICLE_XPATH = etree.XPath('//article[contains(@class, "doc")]')
+ANY_ARTICLE_XPATH = etree.XPath("//article")
+STRIP_TAGS = ("aside", "nav", "script")
+
+# Special Antora pages with no article content worth extracting
+SKIP_HTML = frozenset({"404.html", "sitemap.html", "search.html"})
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Tags whose content is whitespace-sensitive (multi-line shell examples,
+# code listings) and must not be collapsed
+PRESERVE_WHITESPACE_TAGS = frozenset({"pre", "code"})
+
+# The document shell around each extracted article, precomputed as bytes
+HEAD_PRE = b"<html><head><title>"
+HEAD_MID = b"</title></head><body>"
+TAIL = b"</body></html>"
 
 # =============================================================================
 # Utility Functions
 # =============================================================================
 
 
+def json_dumps(obj, *, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes via orjson, or stdlib json when unavailable."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def json_loads(data: bytes):
+    """Deserialize JSON bytes via orjson, or stdlib json when unavailable."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def run(cmd: list[str], cwd: Path | None = None, check: bool = True) -> subprocess.CompletedProcess:
-    """Run a command and return the result."""
-    print(f"  $ {' '.join(cmd)}")
-    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
-#    result = subprocess.run(cmd, cwd=cwd, capture_output=False, text=True)
+    """Run a command, streaming its output live, and return the result.
 
-    if check and result.returncode != 0:
-        print(f"    Error (exit {result.returncode}): {result.stderr[:500]}")
+    Long docs2db/Antora steps can emit MBs of log; streaming keeps memory
+    bounded and gives immediate feedback. Only the last 200 lines are kept
+    (as both stdout and stderr of the returned CompletedProcess) for error
+    reporting.
+    """
+    print(f"  $ {' '.join(cmd)}")
+    proc = subprocess.Popen(
+        cmd, cwd=cwd,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, bufsize=1,
+    )
+    tail: deque[str] = deque(maxlen=200)
+    for line in proc.stdout:
+        print(line, end="")
+        tail.append(line)
+    returncode = proc.wait()
+
+    output = "".join(tail)
+    result = subprocess.CompletedProcess(cmd, returncode, stdout=output, stderr=output)
+    if check and returncode != 0:
+        print(f"    Error (exit {returncode}): {result.stderr[:500]}")
     return result
 
 
+@functools.cache
+def git_supports_partial_clone() -> bool:
+    """Check whether git supports --filter on shallow clones (git >= 2.27)."""
+    result = subprocess.run(["git", "--version"], capture_output=True, text=True)
+    match = re.search(r"(\d+)\.(\d+)", result.stdout)
+    if not match:
+        return False
+    return (int(match.group(1)), int(match.group(2))) >= (2, 27)
+
+
+def ensure_antora_image(container_cmd: str) -> None:
+    """Pre-pull the Antora image so the build step doesn't pay for it."""
+    result = subprocess.run(
+        [container_cmd, "image", "inspect", ANTORA_IMAGE], capture_output=True
+    )
+    if result.returncode != 0:
+        print(f"  Pulling {ANTORA_IMAGE}...")
+        # Don't capture output so the pull progress is visible
+        subprocess.run([container_cmd, "pull", ANTORA_IMAGE])
+
+
+def fetch_ui_bundle(work_dir: Path) -> str:
+    """Download and cache the UI bundle zip. Returns the URL for the playbook."""
+    bundle = work_dir / "ui-bundle.zip"
+    if bundle.exists():
+        return "./ui-bundle.zip"
+
+    # Download to a temp name and rename into place so an interrupted
+    # download can't leave a truncated zip behind for later builds
+    partial = work_dir / "ui-bundle.zip.part"
+    try:
+        urllib.request.urlretrieve(UI_BUNDLE_URL, partial)
+        os.replace(partial, bundle)
+        return "./ui-bundle.zip"
+    except Exception as e:
+        partial.unlink(missing_ok=True)
+        print(f"  Warning: Could not cache UI bundle ({e}), Antora will fetch it")
+        return UI_BUNDLE_URL
+
+
 def check_prerequisites() -> tuple[str | None, list[str]]:
     """Check for required tools. Returns (container_cmd, missing_tools)."""
     missing = []
@@ -67,7 +195,9 @@ def check_prerequisites() -> tuple[str | None, list[str]]:
             container_cmd = cmd
             break
 
-    if not container_cmd:
+    if container_cmd:
+        ensure_antora_image(container_cmd)
+    else:
         missing.append("podman or docker")
 
     # Check for git
@@ -88,15 +218,16 @@ def clone_site_repo(work_dir: Path) -> Path | None:
     
     if site_dir.exists():
         print("    Updating docs-fp-o (prod branch)...")
-        result = run(["git", "pull"], cwd=site_dir, check=False)
+        result = run([*GIT, "pull"], cwd=site_dir, check=False)
     else:
         print("    Cloning docs-fp-o (prod branch)...")
         # site.yml is in the 'prod' branch, not main
-        result = run(
-            ["git", "clone", "--depth", "1", "--branch", "prod", 
-             FEDORA_DOCS_SITE_REPO, str(site_dir)],
-            check=False
-        )
+        cmd = [*GIT, "clone", "--depth", "1", "--single-branch", "--no-tags",
+               "--branch", "prod"]
+        if git_supports_partial_clone():
+            cmd.append("--filter=blob:none")
+        cmd += [FEDORA_DOCS_SITE_REPO, str(site_dir)]
+        result = run(cmd, check=False)
     
     if result.returncode != 0:
         print("    ❌ Failed to clone Fedora docs site repo")
@@ -107,16 +238,14 @@ def clone_site_repo(work_dir: Path) -> Path | None:
 
 def create_simplified_site_yml(site_dir: Path) -> Path:
     """Create a simplified site.yml without custom extensions."""
-    import yaml
-    
     site_yml = site_dir / "site.yml"
     simplified_yml = site_dir / "site-simplified.yml"
-    
+
     if not site_yml.exists():
         return site_yml
-    
+
     with open(site_yml) as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=YAML_LOADER)
     
     # Remove custom extensions that require extra npm packages
     if "antora" in config:
@@ -128,7 +257,7 @@ def create_simplified_site_yml(site_dir: Path) -> Path:
     
     # Write simplified config to new file
     with open(simplified_yml, "w") as f:
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(config, f, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False)
     
     print("  Created site-simplified.yml (removed custom extensions)")
     return simplified_yml
@@ -136,140 +265,176 @@ def create_simplified_site_yml(site_dir: Path) -> Path:
 
 def extract_repos_from_site(site_dir: Path) -> list[str]:
     """Extract content source URLs from the Antora site.yml playbook."""
-    import yaml
-    
     site_yml = site_dir / "site.yml"
     if not site_yml.exists():
         print(f"  Error: site.yml not found in {site_dir}")
         return []
-    
+
     try:
         with open(site_yml) as f:
-            site_config = yaml.safe_load(f)
+            site_config = yaml.load(f, Loader=YAML_LOADER)
     except Exception as e:
         print(f"  Error parsing site.yml: {e}")
         return []
     
-    urls = []
     sources = site_config.get("content", {}).get("sources", [])
-    
-    for source in sources:
-        url = source.get("url", "")
-        if url and url.startswith(("https://", "http://", "git@")):
-            # Normalize URL
-            if not url.endswith(".git"):
-                url = url + ".git"
-            urls.append(url)
-    
-    # Deduplicate while preserving order
-    seen = set()
-    unique_urls = []
-    for url in urls:
-        if url not in seen:
-            seen.add(url)
-            unique_urls.append(url)
+
+    # Normalize URLs and deduplicate in one pass; dict.fromkeys keeps
+    # insertion order
+    urls = (
+        url if url.endswith(".git") else url + ".git"
+        for source in sources
+        for url in [source.get("url", "")]
+        if url.startswith(("https://", "http://", "git@"))
+    )
+    unique_urls = list(dict.fromkeys(urls))
     
     print(f"  Found {len(unique_urls)} unique content sources in site.yml")
     return unique_urls
 
 
+def _clone_or_update(url: str, work_dir: Path) -> tuple[str, Path | None, list[str]]:
+    """Clone or update a single repository.
+
+    Runs in a worker thread, so output is buffered and returned as a list of
+    messages rather than printed (prints from concurrent workers interleave).
+    Returns (name, repo_dir or None on failure, messages).
+    """
+    messages = []
+
+    # Use org/repo format to avoid name clashes (e.g., atomic-desktops_docs)
+    parts = url.rstrip("/").replace(".git", "").split("/")
+    name = f"{parts[-2]}_{parts[-1]}" if len(parts) >= 2 else parts[-1]
+    repo_dir = work_dir / name
+
+    if repo_dir.exists():
+        messages.append(f"    Updating {name}...")
+        # `git pull` on a --depth 1 clone fetches full history and often
+        # refuses to fast-forward; fetch just the new tip and reset to it.
+        # protocol.version=2 keeps the ref advertisement small.
+        result = subprocess.run(
+            [*GIT, "-c", "protocol.version=2", "fetch", "--depth", "1", "origin", "HEAD"],
+            cwd=repo_dir, capture_output=True, text=True,
+        )
+        if result.returncode == 0:
+            result = subprocess.run(
+                [*GIT, "reset", "--hard", "FETCH_HEAD"],
+                cwd=repo_dir, capture_output=True, text=True,
+            )
+        if result.returncode != 0:
+            messages.append(f"    Failed to update {name}, using existing")
+        return name, repo_dir, messages
+
+    messages.append(f"    Cloning {name}...")
+    cmd = [*GIT, "clone", "--depth", "1", "--single-branch", "--no-tags"]
+    if git_supports_partial_clone():
+        # Skip blobs not reachable from HEAD (large historical assets)
+        cmd.append("--filter=blob:none")
+    cmd += [url, str(repo_dir)]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        messages.append(f"    ❌ Failed to clone {name}")
+        return name, None, messages
+
+    return name, repo_dir, messages
+
+
 def clone_repos(repos: list[str], work_dir: Path) -> list[Path]:
-    """Clone or update repositories. Returns list of successfully cloned/updated paths."""
+    """Clone or update repositories in parallel. Returns list of successfully cloned/updated paths."""
     work_dir.mkdir(parents=True, exist_ok=True)
     cloned = []
     failed = []
 
-    for url in repos:
-        # Use org/repo format to avoid name clashes (e.g., atomic-desktops_docs)
-        parts = url.rstrip("/").replace(".git", "").split("/")
-        name = f"{parts[-2]}_{parts[-1]}" if len(parts) >= 2 else parts[-1]
-        repo_dir = work_dir / name
-
-        if repo_dir.exists():
-            print(f"    Updating {name}...")
-            result = run(["git", "pull"], cwd=repo_dir, check=False)
-            if result.returncode == 0:
+    # Clones are network-bound, so overlap them across a thread pool
+    with ThreadPoolExecutor(max_workers=min(8, len(repos))) as executor:
+        futures = [executor.submit(_clone_or_update, url, work_dir) for url in repos]
+        for future in as_completed(futures):
+            name, repo_dir, messages = future.result()
+            for message in messages:
+                print(message)
+            if repo_dir:
                 cloned.append(repo_dir)
             else:
-                print(f"    Failed to update {name}, using existing")
-                cloned.append(repo_dir)
-            continue
-
-        print(f"    Cloning {name}...")
-        result = run(["git", "clone", "--depth", "1", url, str(repo_dir)], check=False)
-
-        if result.returncode == 0:
-            cloned.append(repo_dir)
-        else:
-            print(f"    ❌ Failed to clone {name}")
-            failed.append(name)
+                failed.append(name)
 
     print(f"\n  Clone summary: {len(cloned)}/{len(repos)} successful")
     if failed:
         print(f"  Failed repos: {', '.join(failed)}")
-    
+
     return cloned
 
 
-def get_component_name(antora_yml_path: Path) -> str | None:
-    """Extract component name from antora.yml."""
-    import yaml
+@functools.cache
+def _get_component_name(antora_yml_path: str) -> str | None:
     try:
         with open(antora_yml_path) as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YAML_LOADER)
         return config.get("name")
     except Exception:
         return None
 
 
+def get_component_name(antora_yml_path: str | Path) -> str | None:
+    """Extract component name from antora.yml.
+
+    Results are memoized by path so repeated builds against a cached
+    checkout don't re-read and re-parse the same files.
+    """
+    return _get_component_name(str(antora_yml_path))
+
+
 def create_antora_playbook(work_dir: Path, repo_dirs: list[Path]) -> bool:
     """Create a combined Antora playbook for all repos."""
+    # The repos were just cloned/updated, so drop any stale cached names
+    _get_component_name.cache_clear()
+
     sources = []
     source_details = []  # Track which repos contribute sources
     repos_without_antora = []
     seen_components = set()  # Track component names to skip duplicates
     skipped_duplicates = []
 
+    # Collect candidate antora.yml locations: repo root plus immediate
+    # subdirectories. os.scandir reuses the dirent from readdir, avoiding
+    # an extra stat per entry.
+    candidates = []  # (repo_name, start_path or None, antora.yml path)
     for repo_dir in repo_dirs:
-        repo_has_antora = False  # Track if repo has ANY antora.yml (used or skipped)
-        repo_sources = 0
-        
-        # Check if repo has antora.yml at root
-        antora_yml = repo_dir / "antora.yml"
-        if antora_yml.exists():
-            repo_has_antora = True
-            component = get_component_name(antora_yml)
-            if component and component in seen_components:
-                skipped_duplicates.append(f"{repo_dir.name} (root) -> @{component}")
-            else:
-                if component:
-                    seen_components.add(component)
-                sources.append(f"    - url: ./{repo_dir.name}\n      branches: HEAD")
-                source_details.append(f"{repo_dir.name} (root)")
-                repo_sources += 1
-
-        # Check for antora.yml in subdirectories
-        for subdir in repo_dir.iterdir():
-            antora_yml = subdir / "antora.yml"
-            if subdir.is_dir() and antora_yml.exists():
-                repo_has_antora = True
-                component = get_component_name(antora_yml)
-                if component and component in seen_components:
-                    skipped_duplicates.append(f"{repo_dir.name}/{subdir.name} -> @{component}")
-                else:
-                    if component:
-                        seen_components.add(component)
-                    sources.append(
-                        f"    - url: ./{repo_dir.name}\n"
-                        f"      start_path: {subdir.name}\n"
-                        f"      branches: HEAD"
-                    )
-                    source_details.append(f"{repo_dir.name}/{subdir.name}")
-                    repo_sources += 1
-        
-        if not repo_has_antora:
+        found = 0
+
+        root_yml = repo_dir / "antora.yml"
+        if root_yml.exists():
+            candidates.append((repo_dir.name, None, str(root_yml)))
+            found += 1
+
+        with os.scandir(repo_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                antora_yml = os.path.join(entry.path, "antora.yml")
+                if os.path.exists(antora_yml):
+                    candidates.append((repo_dir.name, entry.name, antora_yml))
+                    found += 1
+
+        if not found:
             repos_without_antora.append(repo_dir.name)
 
+    # The component-name reads are independent file I/O + YAML parses, so
+    # overlap them; deduplication stays single-threaded below to keep the
+    # first-seen-wins ordering deterministic
+    with ThreadPoolExecutor() as executor:
+        names = list(executor.map(get_component_name, (c[2] for c in candidates)))
+
+    for (repo_name, start_path, _), component in zip(candidates, names, strict=True):
+        label = f"{repo_name} (root)" if start_path is None else f"{repo_name}/{start_path}"
+        if component and component in seen_components:
+            skipped_duplicates.append(f"{label} -> @{component}")
+        else:
+            if component:
+                seen_components.add(component)
+            sources.append((repo_name, start_path))
+            source_details.append(label)
+
     # Print detailed source info
     print(f"\n  Antora sources found ({len(sources)} total):")
     for detail in source_details:
@@ -289,16 +454,30 @@ def create_antora_playbook(work_dir: Path, repo_dirs: list[Path]) -> bool:
         print("  Error: No valid Antora sources found!")
         return False
 
+    # Use a locally cached UI bundle when possible so Antora skips the
+    # HTTPS round-trip every build
+    bundle_url = fetch_ui_bundle(work_dir)
+    snapshot = "false" if bundle_url.startswith("./") else "true"
+
+    # Render the source entries in one pass rather than concatenating
+    # per-source multi-line strings
+    source_lines = "\n".join(
+        f"    - url: ./{repo}\n      branches: HEAD"
+        if start_path is None
+        else f"    - url: ./{repo}\n      start_path: {start_path}\n      branches: HEAD"
+        for repo, start_path in sources
+    )
+
     playbook = f"""site:
   title: Fedora Documentation
   start_page: quick-docs::index.adoc
 content:
   sources:
-{chr(10).join(sources)}
+{source_lines}
 ui:
   bundle:
-    url: https://gitlab.com/fedora/docs/docs-website/ui-bundle/-/jobs/artifacts/HEAD/raw/build/ui-bundle.zip?job=bundle-stable
-    snapshot: true
+    url: {bundle_url}
+    snapshot: {snapshot}
 output:
   clean: true
   dir: ./public
@@ -321,97 +500,209 @@ def build_with_antora(container_cmd: str, work_dir: Path, site_yml: str = "site.
         site_yml
     ]
 
-    print(f"  $ {' '.join(cmd)}")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # run() streams the (potentially huge) Antora log live and keeps only
+    # a bounded tail in memory for error reporting
+    result = run(cmd, check=False)
     if result.returncode != 0:
-        print(f"  Error (exit {result.returncode}):")
-        if result.stdout:
-            print(f"  stdout: {result.stdout[:1000]}")
-        if result.stderr:
-            print(f"  stderr: {result.stderr[:1000]}")
+        print(f"  Error (exit {result.returncode}), see log output above")
         return False
 
     print("  Antora build complete!")
     return True
 
 
-def extract_html_content(work_dir: Path, output_dir: Path) -> int:
-    """Extract article content from built HTML files."""
-    import json
-    from collections import defaultdict
+def _collapse_whitespace(element) -> None:
+    """Collapse whitespace runs in text outside pre/code subtrees.
+
+    A child's tail sits outside the child in the document, so it is
+    collapsed by the parent's loop even when the child itself is a <pre>:
+    listings keep their line breaks while the prose around them shrinks.
+    """
+    if element.tag in PRESERVE_WHITESPACE_TAGS:
+        return
+    if element.text:
+        element.text = WHITESPACE_RE.sub(" ", element.text)
+    for child in element:
+        _collapse_whitespace(child)
+        if child.tail:
+            child.tail = WHITESPACE_RE.sub(" ", child.tail)
+
+
+def _write_atomic(output_dir: Path, out_path: Path, data: bytes) -> None:
+    """Write to a temp file and rename into place.
+
+    Concurrent worker processes writing straight into the output directory
+    contend on its lock; writing under .tmp/ and renaming keeps that out of
+    the hot path.
+    """
+    tmp = output_dir / ".tmp" / f"{os.getpid()}-{uuid4().hex}"
+    # Raw os.open/os.write: one syscall pair per file, no buffered-writer
+    # construction on the hot path
+    fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp, out_path)
+
 
-    from bs4 import BeautifulSoup
+def _process_html(
+    args: tuple[Path, Path, Path, str | None],
+) -> tuple[str | None, str | None, str, str | None]:
+    """Extract article content from one built HTML file.
+
+    Runs in a worker process, so arguments arrive as a single picklable
+    (html_file, public_dir, output_dir, old_hash) tuple. Returns
+    (component, warning, rel_path, hash): component is None when the file
+    has no article content, warning is set when processing failed, and
+    hash is the xxhash of the source bytes for the manifest.
+    """
+    html_file, public_dir, output_dir, old_hash = args
+
+    rel_path = html_file.relative_to(public_dir)
+    rel_str = str(rel_path)
+
+    try:
+        data = html_file.read_bytes()
+        digest = xxhash.xxh64(data).hexdigest()
 
+        # Unchanged since the previous run: the outputs (or lack thereof,
+        # for pages with no article) are already correct
+        if digest == old_hash:
+            out_path = output_dir / rel_str.replace("/", "_")
+            component = rel_path.parts[0] if rel_path.parts else "unknown"
+            return (component if out_path.exists() else None), None, rel_str, digest
+
+        # Pass bytes so lxml detects the encoding itself; one C-level parse
+        # replaces the former BeautifulSoup tree walks
+        tree = lxml_html.fromstring(data)
+
+        # Extract main article content
+        articles = ARTICLE_XPATH(tree) or ANY_ARTICLE_XPATH(tree)
+        if not articles:
+            # An earlier version of the page may have had an article;
+            # drop the stale outputs so they aren't re-ingested forever
+            out_name = rel_str.replace("/", "_")
+            (output_dir / out_name).unlink(missing_ok=True)
+            (output_dir / f"{out_name}.meta.json").unlink(missing_ok=True)
+            return None, None, rel_str, digest
+        article = articles[0]
+
+        # Remove navigation elements and comments
+        etree.strip_elements(article, *STRIP_TAGS, with_tail=False)
+        etree.strip_tags(article, etree.Comment)
+
+        # Get title from the file head instead of walking the parse tree
+        match = TITLE_RE.search(data[:4096])
+        if match:
+            title = html.unescape(match.group(1).decode("utf-8", "ignore").strip())
+        else:
+            title = html_file.stem
+
+        # Create output filename
+        out_name = rel_str.replace("/", "_")
+        out_path = output_dir / out_name
+
+        # Write HTML with title, composed directly as bytes; collapse
+        # whitespace runs (outside pre/code) so downstream chunking and
+        # embedding pays for fewer tokens
+        _collapse_whitespace(article)
+        body = etree.tostring(article, method="html")
+        title_b = html.escape(title).encode("utf-8")
+        _write_atomic(output_dir, out_path, b"".join([HEAD_PRE, title_b, HEAD_MID, body, TAIL]))
+
+        # Write metadata. docs2db ingest consumes loose files with one
+        # .meta.json sidecar per document, so the write pair cannot be
+        # coalesced into a tar stream or a combined JSONL.
+        meta_path = output_dir / f"{out_name}.meta.json"
+        meta = {
+            "title": title,
+            "source_url": f"https://docs.fedoraproject.org/{rel_path}",
+            "license": FEDORA_LICENSE,
+        }
+        _write_atomic(output_dir, meta_path, json_dumps(meta, indent=True))
+
+        # Component is the first directory in the path
+        component = rel_path.parts[0] if rel_path.parts else "unknown"
+        return component, None, rel_str, digest
+
+    except Exception as e:
+        return None, f"  Warning: Could not process {html_file}: {e}", rel_str, None
+
+
+def extract_html_content(work_dir: Path, output_dir: Path) -> int:
+    """Extract article content from built HTML files."""
     public_dir = work_dir / "public"
     if not public_dir.exists():
         print(f"  Error: Build output not found at {public_dir}")
         return 0
 
+    # Hashes of the source files from the previous run; unchanged pages
+    # skip re-extraction entirely
+    manifest_path = output_dir / ".manifest.json"
+    old_manifest: dict[str, str] = {}
+    if manifest_path.exists():
+        try:
+            old_manifest = json_loads(manifest_path.read_bytes())
+        except ValueError:
+            old_manifest = {}
+
+    if not old_manifest and output_dir.exists():
+        # No usable manifest: clear previous content in one recursive
+        # removal instead of unlinking thousands of files individually
+        shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Clear previous content
-    for old_file in output_dir.glob("*.html"):
-        old_file.unlink()
-    for old_file in output_dir.glob("*.meta.json"):
-        old_file.unlink()
+    # Largest files first so the longest parses start early and the pool
+    # drains evenly (longest-processing-time scheduling)
+    files = sorted(
+        (p for p in public_dir.rglob("*.html") if p.name not in SKIP_HTML),
+        key=lambda p: -p.stat().st_size,
+    )
 
     count = 0
     skipped_no_article = 0
     component_counts = defaultdict(int)  # Track pages per component
-    
-    for html_file in public_dir.rglob("*.html"):
-        # Skip special files
-        if html_file.name in ("404.html", "sitemap.html", "search.html"):
-            continue
 
-        try:
-            soup = BeautifulSoup(html_file.read_text(errors="ignore"), "html.parser")
-
-            # Extract main article content
-            article = soup.find("article", class_="doc")
-            if not article:
-                article = soup.find("article")
-            if not article:
-                skipped_no_article += 1
-                continue
-
-            # Remove navigation elements
-            for elem in article.find_all(["aside", "nav", "script"]):
-                elem.decompose()
-
-            # Get title
-            title_elem = soup.find("title")
-            title = title_elem.get_text(strip=True) if title_elem else html_file.stem
-
-            # Create output filename
-            rel_path = html_file.relative_to(public_dir)
-            out_name = str(rel_path).replace("/", "_")
-            out_path = output_dir / out_name
-            
-            # Track by component (first directory in path)
-            component = rel_path.parts[0] if rel_path.parts else "unknown"
-            component_counts[component] += 1
+    # Staging area for the workers' atomic writes
+    (output_dir / ".tmp").mkdir(exist_ok=True)
 
-            # Write HTML with title
-            content = f"<html><head><title>{title}</title></head><body>{article}</body></html>"
-            out_path.write_text(content, encoding="utf-8")
+    new_manifest: dict[str, str] = {}
 
-            # Write metadata
-            meta_path = output_dir / f"{out_name}.meta.json"
-            meta = {
-                "title": title,
-                "source_url": f"https://docs.fedoraproject.org/{rel_path}",
-                "license": FEDORA_LICENSE,
-            }
-            meta_path.write_text(json.dumps(meta, indent=2))
+    try:
+        # Parsing is CPU-bound, so fan the files out across cores
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = executor.map(
+                _process_html,
+                [
+                    (f, public_dir, output_dir, old_manifest.get(str(f.relative_to(public_dir))))
+                    for f in files
+                ],
+                chunksize=8,
+            )
+            for component, warning, rel_str, digest in results:
+                if digest:
+                    new_manifest[rel_str] = digest
+                if warning:
+                    print(warning)
+                elif component is None:
+                    skipped_no_article += 1
+                else:
+                    component_counts[component] += 1
+                    count += 1
+    finally:
+        shutil.rmtree(output_dir / ".tmp", ignore_errors=True)
 
-            count += 1
+    # Drop outputs for pages that no longer exist upstream
+    for rel_str in old_manifest.keys() - new_manifest.keys():
+        out_name = rel_str.replace("/", "_")
+        (output_dir / out_name).unlink(missing_ok=True)
+        (output_dir / f"{out_name}.meta.json").unlink(missing_ok=True)
 
-        except Exception as e:
-            print(f"  Warning: Could not process {html_file}: {e}")
+    manifest_path.write_bytes(json_dumps(new_manifest))
 
     # Print extraction summary
-    print(f"\n  Pages extracted by component:")
+    print("\n  Pages extracted by component:")
     for component, comp_count in sorted(component_counts.items(), key=lambda x: -x[1]):
         print(f"    {component}: {comp_count} pages")
     
@@ -421,40 +712,88 @@ def extract_html_content(work_dir: Path, output_dir: Path) -> int:
     return count
 
 
+@functools.cache
+def _docs2db_cli():
+    """Import the docs2db Click CLI once; None when not importable."""
+    try:
+        from docs2db.cli import cli
+    except (ImportError, AttributeError):
+        return None
+    return cli
+
+
+def run_docs2db(args: list[str]) -> bool:
+    """Invoke a docs2db subcommand.
+
+    Spawning `uv run docs2db` per step pays venv resolution, interpreter
+    cold-start, and a fresh import of docs2db's module tree seven times
+    over a build. Call the CLI in-process when docs2db is importable
+    (imports happen once), falling back to the subprocess otherwise.
+    """
+    cli = _docs2db_cli()
+    if cli is None:
+        result = run(["uv", "run", "docs2db", *args], check=False)
+        return result.returncode == 0
+
+    print(f"  $ docs2db {' '.join(args)}")
+    try:
+        # With standalone_mode=False, Click reports ctx.exit(code) by
+        # *returning* the exit code rather than raising SystemExit
+        rv = cli.main(list(args), standalone_mode=False)
+    except SystemExit as e:
+        return not e.code
+    except Exception as e:
+        print(f"    Error: {e}")
+        return False
+    if isinstance(rv, int) and rv != 0:
+        print(f"    Error (exit {rv})")
+        return False
+    return True
+
+
 def run_docs2db_db_destroy() -> bool:
     """Run docs2db db-destroy to ensure clean state."""
-    cmd = ["uv", "run", "docs2db", "db-destroy"]
-    result = run(cmd, check=False)
     # db-destroy may fail if no database exists, that's OK
+    run_docs2db(["db-destroy"])
     return True
 
 
 def run_docs2db_db_start() -> bool:
     """Run docs2db db-start to start the database."""
-    cmd = ["uv", "run", "docs2db", "db-start"]
-    result = run(cmd, check=False)
-    return result.returncode == 0
+    return run_docs2db(["db-start"])
+
+
+def wait_for_db(timeout: float = 60.0) -> bool:
+    """Poll PostgreSQL until it accepts connections or the timeout expires."""
+    if not shutil.which("pg_isready"):
+        # No client tools on the host; fall back to a fixed grace period
+        time.sleep(5)
+        return True
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = subprocess.run(
+            ["pg_isready", "-h", "localhost"], capture_output=True
+        )
+        if result.returncode == 0:
+            return True
+        time.sleep(0.25)
+    return False
 
 
 def run_docs2db_ingest(content_dir: Path) -> bool:
     """Run docs2db ingest on the extracted content."""
-    cmd = ["uv", "run", "docs2db", "ingest", str(content_dir)]
-    result = run(cmd, check=False)
-    return result.returncode == 0
+    return run_docs2db(["ingest", str(content_dir)])
 
 
 def run_docs2db_chunk() -> bool:
     """Run docs2db chunk (without contextual chunking - no LLM required)."""
-    cmd = ["uv", "run", "docs2db", "chunk", "--skip-context"]
-    result = run(cmd, check=False)
-    return result.returncode == 0
+    return run_docs2db(["chunk", "--skip-context"])
 
 
-def run_docs2db_embed() -> bool:
+def run_docs2db_embed(workers: int = EMBED_WORKERS) -> bool:
     """Run docs2db embed."""
-    cmd = ["uv", "run", "docs2db", "embed", "--workers", "1"]
-    result = run(cmd, check=False)
-    return result.returncode == 0
+    return run_docs2db(["embed", "--workers", str(workers)])
 
 
 def run_docs2db_config_refinement() -> bool:
@@ -502,36 +841,24 @@ If the user query could reasonably relate to Fedora, Linux, or open source, proc
 - DO NOT include any introduction, explanation, commentary, or conclusion.
 
 User query: {question}'''
-    
-    cmd = ["uv", "run", "docs2db", "config", "--refinement-prompt", prompt]
-    result = run(cmd, check=False)
-    return result.returncode == 0
+
+    return run_docs2db(["config", "--refinement-prompt", prompt])
 
 
 def run_docs2db_load(title: str, description: str) -> bool:
     """Run docs2db load to insert data into the database."""
-    cmd = [
-        "uv", "run", "docs2db", "load",
-        "--title", title,
-        "--description", description,
-    ]
-    result = run(cmd, check=False)
-    return result.returncode == 0
+    return run_docs2db(["load", "--title", title, "--description", description])
 
 
 def run_docs2db_db_dump(output_file: Path) -> bool:
     """Run docs2db db-dump to create the database dump."""
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    cmd = ["uv", "run", "docs2db", "db-dump", "--output-file", str(output_file)]
-    result = run(cmd, check=False)
-    return result.returncode == 0
+    return run_docs2db(["db-dump", "--output-file", str(output_file)])
 
 
 def run_docs2db_db_stop() -> bool:
     """Run docs2db db-stop to stop the database."""
-    cmd = ["uv", "run", "docs2db", "db-stop"]
-    result = run(cmd, check=False)
-    return result.returncode == 0
+    return run_docs2db(["db-stop"])
 
 
 def cleanup(work_dir: Path) -> None:
@@ -629,7 +956,9 @@ def main() -> int:
         return 1
     
     print("  Waiting for PostgreSQL to initialize...")
-    time.sleep(5)
+    if not wait_for_db():
+        print("Error: Database did not become ready!")
+        return 1
 
     # Step 11: Configure refinement prompt
     print(f"\n[11/{steps_total}] Configuring RAG refinement prompt...")